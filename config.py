@@ -4,10 +4,53 @@ DESCRIPTION:
   Values can be set via environment variables or a .env file.
 """
 
+import fnmatch
+import re
+from functools import lru_cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Immutable defaults (shared by every Settings instance, no factory call)
+_SKIP_KEYS_DEFAULT = ("time", "protocol", "mod", "id")
+_DEVICE_BLACKLIST_DEFAULT = ("SimpliSafe*", "EezTire*")
+_MAIN_SENSORS_DEFAULT = (
+    "sys_device_count",
+    "temperature",
+    "temperature_C",
+    "temperature_F",
+    "dew_point",
+    "humidity",
+    "pressure_hpa",
+    "pressure_inhg",
+    "pressure_PSI",
+    "co2",
+    "mics_ratio",
+    "mq2_ratio",
+    "mag_uT",
+    "geomag_index",
+    "wind_avg_km_h",
+    "wind_avg_mi_h",
+    "wind_gust_km_h",
+    "wind_gust_mi_h",
+    "wind_dir_deg",
+    "wind_dir",
+    "rain_mm",
+    "rain_in",
+    "rain_rate_mm_h",
+    "rain_rate_in_h",
+    "lux",
+    "uv",
+    "strikes",
+    "strike_distance",
+    "storm_dist",
+    "Consumption",
+    "consumption",
+    "meter_reading",
+)
+
+
 class Settings(BaseSettings):
     """Main application settings."""
 
@@ -58,57 +101,24 @@ class Settings(BaseSettings):
     )
 
     # Keys to skip when publishing sensor data
-    skip_keys: list[str] = Field(
-        default_factory=lambda: ["time", "protocol", "mod", "id"],
+    skip_keys: tuple[str, ...] = Field(
+        default=_SKIP_KEYS_DEFAULT,
         description="Keys to skip when publishing",
     )
 
     # Device filtering
-    device_blacklist: list[str] = Field(
-        default_factory=lambda: ["SimpliSafe*", "EezTire*"],
+    device_blacklist: tuple[str, ...] = Field(
+        default=_DEVICE_BLACKLIST_DEFAULT,
         description="Device patterns to block",
     )
-    device_whitelist: list[str] = Field(
-        default_factory=list,
+    device_whitelist: tuple[str, ...] = Field(
+        default=(),
         description="If non-empty, only these device patterns are allowed",
     )
 
     # Main sensors (shown in main panel vs diagnostics)
-    main_sensors: list[str] = Field(
-        default_factory=lambda: [
-            "sys_device_count",
-            "temperature",
-            "temperature_C",
-            "temperature_F",
-            "dew_point",
-            "humidity",
-            "pressure_hpa",
-            "pressure_inhg",
-            "pressure_PSI",
-            "co2",
-            "mics_ratio",
-            "mq2_ratio",
-            "mag_uT",
-            "geomag_index",
-            "wind_avg_km_h",
-            "wind_avg_mi_h",
-            "wind_gust_km_h",
-            "wind_gust_mi_h",
-            "wind_dir_deg",
-            "wind_dir",
-            "rain_mm",
-            "rain_in",
-            "rain_rate_mm_h",
-            "rain_rate_in_h",
-            "lux",
-            "uv",
-            "strikes",
-            "strike_distance",
-            "storm_dist",
-            "Consumption",
-            "consumption",
-            "meter_reading",
-        ],
+    main_sensors: tuple[str, ...] = Field(
+        default=_MAIN_SENSORS_DEFAULT,
         description="Sensors shown in main panel (not diagnostics)",
     )
 
@@ -127,6 +137,10 @@ class Settings(BaseSettings):
     rtl_throttle_interval: int = Field(
         default=30, description="Seconds to buffer data before sending (0=realtime)"
     )
+    rtl_republish_interval: int = Field(
+        default=120,
+        description="Min seconds between re-sending an unchanged value (0=every reading)",
+    )
 
     @property
     def id_suffix(self) -> str:
@@ -134,31 +148,72 @@ class Settings(BaseSettings):
         return "_v2" if self.force_new_ids else ""
 
 
+def _compile_patterns(patterns):
+    """Compiles a list of fnmatch wildcards into one regex matcher (None if empty)."""
+    if not patterns:
+        return None
+    # Shared community lists often repeat entries; compile each glob only once
+    unique = dict.fromkeys(str(p) for p in patterns)
+    union = "|".join(f"(?:{fnmatch.translate(p)})" for p in unique)
+    return re.compile(union).match
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Returns the shared Settings instance (.env is parsed only once)."""
+    return Settings()
+
+
+@lru_cache(maxsize=1)
+def get_mqtt_settings() -> dict:
+    """Returns the legacy MQTT_SETTINGS dict built from the shared Settings."""
+    s = get_settings()
+    return {
+        "host": s.mqtt_host,
+        "port": s.mqtt_port,
+        "user": s.mqtt_user,
+        "pass": s.mqtt_pass,
+        "keepalive": s.mqtt_keepalive,
+    }
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 BRIDGE_ID = settings.bridge_id
 BRIDGE_NAME = settings.bridge_name
 
 # Convenience aliases for backward compatibility
-MQTT_SETTINGS = {
-    "host": settings.mqtt_host,
-    "port": settings.mqtt_port,
-    "user": settings.mqtt_user,
-    "pass": settings.mqtt_pass,
-    "keepalive": settings.mqtt_keepalive,
-}
+MQTT_SETTINGS = get_mqtt_settings()
 RTL_CONFIG = settings.rtl_config
-SKIP_KEYS = settings.skip_keys
+SKIP_KEYS = frozenset(settings.skip_keys)
 DEVICE_BLACKLIST = settings.device_blacklist
 DEVICE_WHITELIST = settings.device_whitelist
-MAIN_SENSORS = settings.main_sensors
+MAIN_SENSORS = frozenset(settings.main_sensors)
 RTL_EXPIRE_AFTER = settings.rtl_expire_after
 FORCE_NEW_IDS = settings.force_new_ids
 ID_SUFFIX = settings.id_suffix
 DEBUG_RAW_JSON = settings.debug_raw_json
 RTL_THROTTLE_INTERVAL = settings.rtl_throttle_interval
+# Unchanged values must still be re-sent well inside expire_after, or HA marks them unavailable
+RTL_REPUBLISH_INTERVAL = (
+    min(settings.rtl_republish_interval, settings.rtl_expire_after // 2)
+    if settings.rtl_expire_after > 0 else settings.rtl_republish_interval
+)
 
 # EXPORT NEW DEFAULTS
 RTL_DEFAULT_FREQ = settings.rtl_default_freq
-RTL_DEFAULT_HOP_INTERVAL = settings.rtl_default_hop_interval
\ No newline at end of file
+RTL_DEFAULT_HOP_INTERVAL = settings.rtl_default_hop_interval
+
+# Precompiled device filters (built once, probed per packet)
+DEVICE_BLACKLIST_MATCH = _compile_patterns(DEVICE_BLACKLIST)
+DEVICE_WHITELIST_MATCH = _compile_patterns(DEVICE_WHITELIST)
+
+
+def device_allowed(clean_id: str, model: str) -> bool:
+    """Whitelist (if set) overrides the blacklist, same as the old fnmatch loops."""
+    if DEVICE_WHITELIST_MATCH:
+        return bool(DEVICE_WHITELIST_MATCH(clean_id) or DEVICE_WHITELIST_MATCH(model))
+    if DEVICE_BLACKLIST_MATCH:
+        return not (DEVICE_BLACKLIST_MATCH(clean_id) or DEVICE_BLACKLIST_MATCH(model))
+    return True
@@ -3,11 +3,11 @@ FILE: data_processor.py
 DESCRIPTION:
   Handles data buffering, throttling, and averaging to reduce MQTT traffic.
   - dispatch_reading(): Adds data to buffer or sends immediately if throttling is 0.
+    Buffered fields keep a running sum/count instead of every raw sample.
   - start_throttle_loop(): Runs in a background thread to flush averages.
 """
 import threading
 import time
-import statistics
 import config
 
 class DataProcessor:
@@ -15,40 +15,51 @@ class DataProcessor:
         self.mqtt_handler = mqtt_handler
         self.buffer = {}
         self.lock = threading.Lock()
+        # Read once: both are fixed for the process lifetime
+        self.throttle_interval = config.RTL_THROTTLE_INTERVAL
+        self.debug = config.DEBUG_RAW_JSON
+
+        # No throttling: route readings straight to MQTT, bypassing the buffer logic
+        if self.throttle_interval <= 0:
+            self.dispatch_reading = self._dispatch_direct
+
+    def _dispatch_direct(self, clean_id, field, value, dev_name, model):
+        """dispatch_reading() when throttling is disabled."""
+        self.mqtt_handler.send_sensor(clean_id, field, value, dev_name, model, is_rtl=True)
 
     def dispatch_reading(self, clean_id, field, value, dev_name, model):
         """
-        Ingests a sensor reading.
-        If throttling is disabled (interval <= 0), sends immediately.
-        Otherwise, stores it in the buffer.
+        Ingests a sensor reading into the throttle buffer.
+        If throttling is disabled (interval <= 0), __init__ replaces this
+        with _dispatch_direct(), which sends immediately.
         """
-        interval = getattr(config, "RTL_THROTTLE_INTERVAL", 0)
-        
-        # 1. Immediate Dispatch (No Throttling)
-        if interval <= 0:
-            self.mqtt_handler.send_sensor(clean_id, field, value, dev_name, model, is_rtl=True)
-            return
-
-        # 2. Buffered Dispatch
         with self.lock:
-            if clean_id not in self.buffer:
-                self.buffer[clean_id] = {}
-            
-            # Store metadata so we know who this device is when flushing
-            if "__meta__" not in self.buffer[clean_id]:
-                self.buffer[clean_id]["__meta__"] = {"name": dev_name, "model": model}
-            
-            if field not in self.buffer[clean_id]:
-                self.buffer[clean_id][field] = []
+            device = self.buffer.get(clean_id)
+            if device is None:
+                # Store metadata so we know who this device is when flushing
+                device = self.buffer[clean_id] = {"__meta__": {"name": dev_name, "model": model}}
             
-            self.buffer[clean_id][field].append(value)
+            # Running aggregate per field: [sum, count, last]
+            # 'sum' becomes None once a non-numeric value is seen (use last value)
+            # Exact class check: bools are ints to isinstance() but must publish as True/False
+            is_num = value.__class__ in (int, float)
+            slot = device.get(field)
+            if slot is None:
+                device[field] = [value if is_num else None, 1, value]
+            else:
+                if slot[0] is not None and is_num:
+                    slot[0] += value
+                else:
+                    slot[0] = None
+                slot[1] += 1
+                slot[2] = value
 
     def start_throttle_loop(self):
         """
         Thread loop that wakes up every RTL_THROTTLE_INTERVAL seconds,
         averages the buffered data, and sends it to MQTT.
         """
-        interval = getattr(config, "RTL_THROTTLE_INTERVAL", 30)
+        interval = self.throttle_interval
         if interval <= 0:
             return
 
@@ -57,14 +68,14 @@ class DataProcessor:
         while True:
             time.sleep(interval)
             
-            # 1. Swap buffers safely
+            # 1. Swap buffers safely (rebind, O(1) under the lock)
             with self.lock:
                 if not self.buffer:
                     continue
-                current_batch = self.buffer.copy()
-                self.buffer.clear()
+                current_batch = self.buffer
+                self.buffer = {}
 
-            count_sent = 0
+            batch = []
             
             # 2. Process batch
             for clean_id, device_data in current_batch.items():
@@ -72,27 +83,27 @@ class DataProcessor:
                 dev_name = meta.get("name", "Unknown")
                 model = meta.get("model", "Unknown")
 
-                for field, values in device_data.items():
+                for field, slot in device_data.items():
                     if field == "__meta__": 
                         continue
-                    if not values: 
-                        continue
 
                     # Calculate Average (or last known value for strings)
-                    final_val = None
-                    try:
-                        if isinstance(values[0], (int, float)):
-                            final_val = round(statistics.mean(values), 2)
-                            # If it's a whole number (like 50.0), make it int (50)
-                            if final_val.is_integer(): 
-                                final_val = int(final_val)
-                        else:
-                            final_val = values[-1]
-                    except:
-                        final_val = values[-1]
+                    total, count, last = slot
+                    if total is None:
+                        final_val = last
+                    elif total.__class__ is int and total % count == 0:
+                        # Integer samples with a whole mean: exact, no float round-trip
+                        final_val = total // count
+                    else:
+                        final_val = round(total / count, 2)
+                        # If it's a whole number (like 50.0), make it int (50)
+                        if final_val.is_integer(): 
+                            final_val = int(final_val)
 
-                    self.mqtt_handler.send_sensor(clean_id, field, final_val, dev_name, model, is_rtl=True)
-                    count_sent += 1
+                    batch.append((clean_id, field, final_val, dev_name, model))
+            
+            # 3. Publish the whole flush in one call
+            self.mqtt_handler.send_sensor_batch(batch, is_rtl=True)
             
-            if getattr(config, "DEBUG_RAW_JSON", False) and count_sent > 0:
-                print(f"[THROTTLE] Flushed {count_sent} averaged readings.")
\ No newline at end of file
+            if self.debug and batch:
+                print(f"[THROTTLE] Flushed {len(batch)} averaged readings.")
\ No newline at end of file
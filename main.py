@@ -12,27 +12,67 @@ DESCRIPTION:
   - UPDATED: Version entity removed (now part of Device Info).
 """
 import builtins
-from datetime import datetime
+import atexit
+import queue
+import signal
+import sys
+import threading
+import time
 
 # --- 1. GLOBAL TIMESTAMP OVERRIDE ---
 # Save the original print function so we don't cause an infinite recursion
 _original_print = builtins.print
 
+# Log lines are handed to a writer thread so radio/MQTT threads never block on stdout
+_log_queue = queue.SimpleQueue()
+
+# (epoch second, formatted stamp) - only re-formatted when the second changes
+_ts_cache = (0, "")
+
+def _timestamp():
+    global _ts_cache
+    sec = int(time.time())
+    if sec != _ts_cache[0]:
+        _ts_cache = (sec, time.strftime("[%H:%M:%S]", time.localtime(sec)))
+    return _ts_cache[1]
+
 def timestamped_print(*args, **kwargs):
     """Adds a timestamp to every print() call."""
     # Format: [18:05:00] INFO:
-    now = datetime.now().strftime("[%H:%M:%S]")
+    now = _timestamp()
     
     # Mimic the bashio style (Short time + INFO tag)
-    _original_print(f"{now} INFO:", *args, **kwargs)
-    
+    _log_queue.put_nowait((f"{now} INFO:", args, kwargs))
+
+def _log_writer():
+    """Drains the log queue to the real stdout (None = shutdown)."""
+    while True:
+        record = _log_queue.get()
+        if record is None:
+            break
+        prefix, args, kwargs = record
+        try:
+            _original_print(prefix, *args, **kwargs)
+        except Exception as e:
+            # One unprintable record must not end logging for the whole process
+            try:
+                sys.__stderr__.write(f"{prefix} [LOG] Failed to write log line: {e!r}\n")
+            except Exception:
+                pass
+
+def _flush_log():
+    """Writes out anything still queued before the interpreter exits."""
+    _log_queue.put_nowait(None)
+    _log_thread.join(timeout=2)
+
+_log_thread = threading.Thread(target=_log_writer, daemon=True)
+_log_thread.start()
+atexit.register(_flush_log)
+
 # Overwrite Python's built-in print with our new version
 builtins.print = timestamped_print
 # ------------------------------------
 
-import threading
-import time
-import sys
 import importlib.util
 import subprocess
 import os
@@ -94,7 +134,7 @@ def main():
     sys_name = f"{sys_model} ({sys_id})"
 
     # 4. START RTL RADIO THREADS
-    rtl_config = getattr(config, "RTL_CONFIG", None)
+    rtl_config = config.RTL_CONFIG
 
     if rtl_config:
         # Explicit radios from config.py (Advanced Mode)
@@ -140,12 +180,15 @@ def main():
         daemon=True
     ).start()
 
-    # 6. MAIN LOOP
+    # 6. MAIN LOOP (sleep until SIGTERM / Ctrl+C, no periodic wake-ups)
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
     try:
-        while True: time.sleep(1)
+        stop_event.wait()
     except KeyboardInterrupt:
-        print("\n[SHUTDOWN] Stopping MQTT...")
-        mqtt_handler.stop()
+        pass
+    print("\n[SHUTDOWN] Stopping MQTT...")
+    mqtt_handler.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
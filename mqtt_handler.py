@@ -14,11 +14,38 @@ import sys
 import time
 import paho.mqtt.client as mqtt
 from paho.mqtt.enums import CallbackAPIVersion
+
+# Optional fast JSON encoder (returns bytes, which paho publishes as-is)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_dumps = json.dumps
+
 # Local imports
 import config
 from utils import clean_mac, get_system_mac
 from field_meta import FIELD_META
 
+_RADIO_STATUS = "radio_status"
+_RADIO_STATUS_PREFIX = "radio_status_"
+
+# device_class -> HA state_class (graphs/statistics); unlisted classes get none
+_STATE_CLASS_MAP = {
+    "gas": "total_increasing",
+    "energy": "total_increasing",
+    "water": "total_increasing",
+    "monetary": "total_increasing",
+    "precipitation": "total_increasing",
+    "temperature": "measurement",
+    "humidity": "measurement",
+    "pressure": "measurement",
+    "illuminance": "measurement",
+    "voltage": "measurement",
+    "wind_speed": "measurement",
+    "wind_direction": "measurement_angle",
+}
+
 class HomeNodeMQTT:
     def __init__(self, version="Unknown"):
         self.sw_version = version  # Store version for device registry
@@ -26,6 +53,8 @@ class HomeNodeMQTT:
         self.TOPIC_AVAILABILITY = f"home/status/rtl_bridge{config.ID_SUFFIX}/availability"
         self.client.username_pw_set(config.MQTT_SETTINGS["user"], config.MQTT_SETTINGS["pass"])
         self.client.will_set(self.TOPIC_AVAILABILITY, "offline", retain=True)
+        # Cap the auto-reconnect backoff (paho default is 120s) so a broker restart only costs seconds
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
         
         # Callbacks
         self.client.on_connect = self._on_connect
@@ -33,7 +62,20 @@ class HomeNodeMQTT:
 
         self.discovery_published = set()
         self.last_sent_values = {}
+        self.last_publish_times = {}
         self.tracked_devices = set()
+        # Fields shown on the main panel (everything else is diagnostic)
+        self.main_sensors = config.MAIN_SENSORS
+        # (field, friendly_name) -> (name, entity attrs) shared by all devices
+        self._entity_cache = {}
+        # (device_model, device_name, clean_id) -> device registry block
+        self._device_cache = {}
+        # (sensor_id, field) -> (state_topic, unique_id, clean_id)
+        self._topic_cache = {}
+        self.TOPIC_CACHE_MAX = 4096
+        # Encoded payloads for repeating string/bool states ("Online", "OK", True...)
+        self._payload_cache = {}
+        self.PAYLOAD_CACHE_MAX = 1024
         
         self.discovery_lock = threading.Lock()
 
@@ -69,14 +111,15 @@ class HomeNodeMQTT:
             # 2. Handle Nuke Scanning (Search & Destroy)
             if self.is_nuking:
                 if not msg.payload: return
+                # Cheap bytes check first: foreign discovery configs never get parsed
+                if b"rtl-haos" not in msg.payload: return
 
                 try:
-                    payload_str = msg.payload.decode("utf-8")
-                    data = json.loads(payload_str)
+                    data = json.loads(msg.payload)
                     
-                    # Check Manufacturer Signature
-                    device_info = data.get("device", {})
-                    manufacturer = device_info.get("manufacturer", "")
+                    # Check Manufacturer Signature (abbreviated or long-form discovery keys)
+                    device_info = data.get("dev") or data.get("device") or {}
+                    manufacturer = device_info.get("mf") or device_info.get("manufacturer") or ""
 
                     if "rtl-haos" in manufacturer:
                         # SAFETY: Don't delete the Nuke button itself!
@@ -96,28 +139,29 @@ class HomeNodeMQTT:
         sys_id = get_system_mac().replace(":", "").lower()
         unique_id = f"rtl_bridge_nuke{config.ID_SUFFIX}"
         
+        # Abbreviated HA discovery keys (cmd_t = command_topic, dev = device, ...)
         payload = {
             "name": "Delete Entities (Press 5x)",
-            "command_topic": self.nuke_command_topic,
-            "unique_id": unique_id,
-            "icon": "mdi:delete-alert",
-            "entity_category": "config",
-            "device": {
-                "identifiers": [f"rtl433_{config.BRIDGE_NAME}_{sys_id}"],
-                "manufacturer": "rtl-haos",
-                "model": config.BRIDGE_NAME,
+            "cmd_t": self.nuke_command_topic,
+            "uniq_id": unique_id,
+            "ic": "mdi:delete-alert",
+            "ent_cat": "config",
+            "dev": {
+                "ids": [f"rtl433_{config.BRIDGE_NAME}_{sys_id}"],
+                "mf": "rtl-haos",
+                "mdl": config.BRIDGE_NAME,
                 "name": f"{config.BRIDGE_NAME} ({sys_id})",
-                "sw_version": self.sw_version  # Inject Version Here
+                "sw": self.sw_version  # Inject Version Here
             },
-            "availability_topic": self.TOPIC_AVAILABILITY
+            "avty_t": self.TOPIC_AVAILABILITY
         }
         
         config_topic = f"homeassistant/button/{unique_id}/config"
-        self.client.publish(config_topic, json.dumps(payload), retain=True)
+        self.client.publish(config_topic, _json_dumps(payload), retain=True)
 
     def _handle_nuke_press(self):
         """Counts presses and triggers Nuke if threshold met."""
-        now = time.time()
+        now = time.monotonic()
         
         # Reset if too much time passed
         if now - self.nuke_last_press > self.NUKE_TIMEOUT:
@@ -136,6 +180,8 @@ class HomeNodeMQTT:
 
     def nuke_all(self):
         """Activates the Search-and-Destroy protocol."""
+        if self.is_nuking: return  # Scan already running; its timer will end it
+
         print("\n" + "!"*50)
         print("[NUKE] DETONATED! Scanning MQTT for 'rtl-haos' devices...")
         print("!"*50 + "\n")
@@ -157,6 +203,7 @@ class HomeNodeMQTT:
         with self.discovery_lock:
             self.discovery_published.clear()
             self.last_sent_values.clear()
+            self.last_publish_times.clear()
             self.tracked_devices.clear()
 
         print(f"[NUKE] Scan Complete. All identified entities removed.")
@@ -184,101 +231,163 @@ class HomeNodeMQTT:
         self.client.loop_stop()
         self.client.disconnect()
 
-    def _publish_discovery(self, sensor_name, state_topic, unique_id, device_name, device_model, friendly_name_override=None):
-        unique_id = f"{unique_id}{config.ID_SUFFIX}"
+    def _build_entity_config(self, sensor_name, friendly_name_override=None):
+        """Returns (friendly_name, attrs) for a field; device-independent, so cacheable."""
+        # Per-radio status fields ("radio_status_<id>") share one definition
+        is_radio_status = sensor_name.startswith(_RADIO_STATUS)
+        if is_radio_status:
+            meta = FIELD_META.get(_RADIO_STATUS)
+        else:
+            meta = FIELD_META.get(sensor_name)
+
+        # Only build the generic fallback for unknown (or malformed) fields
+        if meta is None or len(meta) != 4:
+            meta = (None, "none", "mdi:eye", sensor_name.replace("_", " ").title())
+        unit, device_class, icon, default_fname = meta
+
+        if friendly_name_override:
+            friendly_name = friendly_name_override
+        elif is_radio_status and sensor_name.startswith(_RADIO_STATUS_PREFIX):
+            suffix = sensor_name[len(_RADIO_STATUS_PREFIX):]
+            friendly_name = f"{default_fname} {suffix}"
+        else:
+            friendly_name = default_fname
+
+        entity_cat = "diagnostic"
+        if sensor_name in self.main_sensors:
+            entity_cat = None 
+        if is_radio_status:
+            entity_cat = None
+
+        # Abbreviated HA discovery keys keep retained configs small
+        attrs = {"ic": icon}
+
+        if unit: attrs["unit_of_meas"] = unit
+        if device_class != "none": attrs["dev_cla"] = device_class
+        if entity_cat: attrs["ent_cat"] = entity_cat
+
+        state_class = _STATE_CLASS_MAP.get(device_class)
+        if state_class: attrs["stat_cla"] = state_class
+
+        # UPDATED: Disable expiration for radio_status so it doesn't go Unavailable during silence
+        if "version" not in sensor_name.lower() and not is_radio_status:
+            attrs["exp_aft"] = config.RTL_EXPIRE_AFTER
+
+        return friendly_name, attrs
+
+    def _publish_discovery(self, sensor_name, state_topic, unique_id, device_name, device_model, friendly_name_override=None, clean_id=None):
+        """Publishes the HA config for unique_id (already carrying ID_SUFFIX) once."""
+        # Fast path: set membership is atomic under the GIL, so the steady
+        # state (already published) never touches the lock.
+        if unique_id in self.discovery_published:
+            return
 
         with self.discovery_lock:
+            # Re-check: another thread may have published while we waited
             if unique_id in self.discovery_published:
                 return
 
-            default_meta = (None, "none", "mdi:eye", sensor_name.replace("_", " ").title())
-            
-            if sensor_name.startswith("radio_status"):
-                base_meta = FIELD_META.get("radio_status", default_meta)
-                unit, device_class, icon, default_fname = base_meta
-            else:
-                meta = FIELD_META.get(sensor_name, default_meta)
-                try:
-                    unit, device_class, icon, default_fname = meta
-                except ValueError:
-                    unit, device_class, icon, default_fname = default_meta
-
-            if friendly_name_override:
-                friendly_name = friendly_name_override
-            elif sensor_name.startswith("radio_status_"):
-                suffix = sensor_name.replace("radio_status_", "")
-                friendly_name = f"{default_fname} {suffix}"
-            else:
-                friendly_name = default_fname
-
-            entity_cat = "diagnostic"
-            if sensor_name in getattr(config, 'MAIN_SENSORS', []):
-                entity_cat = None 
-            if sensor_name.startswith("radio_status"):
-                entity_cat = None
+            # Entity attributes only depend on the field, so reuse them across devices
+            key = (sensor_name, friendly_name_override)
+            entity = self._entity_cache.get(key)
+            if entity is None:
+                entity = self._build_entity_config(sensor_name, friendly_name_override)
+                self._entity_cache[key] = entity
+            friendly_name, entity_attrs = entity
 
-            # --- DEVICE REGISTRY ---
-            device_registry = {
-                "identifiers": [f"rtl433_{device_model}_{unique_id.split('_')[0]}"],
-                "manufacturer": "rtl-haos",
-                "model": device_model,
-                "name": device_name 
-            }
-            
-            # Inject Firmware Version ONLY for the Bridge itself
-            if device_model == config.BRIDGE_NAME:
-                device_registry["sw_version"] = self.sw_version
+            if clean_id is None:
+                clean_id = unique_id.split('_')[0]
 
+            # --- DEVICE REGISTRY ---
+            # Identical for every field of a device; it's only read while serialising
+            dev_key = (device_model, device_name, clean_id)
+            device_registry = self._device_cache.get(dev_key)
+            if device_registry is None:
+                device_registry = {
+                    "ids": [f"rtl433_{device_model}_{clean_id}"],
+                    "mf": "rtl-haos",
+                    "mdl": device_model,
+                    "name": device_name 
+                }
+                
+                # Inject Firmware Version ONLY for the Bridge itself
+                if device_model == config.BRIDGE_NAME:
+                    device_registry["sw"] = self.sw_version
+                self._device_cache[dev_key] = device_registry
+
+            # Abbreviated HA discovery keys (stat_t = state_topic, dev = device, ...)
             payload = {
                 "name": friendly_name,
-                "state_topic": state_topic,
-                "unique_id": unique_id,
-                "device": device_registry,
-                "icon": icon,
+                "stat_t": state_topic,
+                "uniq_id": unique_id,
+                "dev": device_registry,
             }
-
-            if unit: payload["unit_of_measurement"] = unit
-            if device_class != "none": payload["device_class"] = device_class
-            if entity_cat: payload["entity_category"] = entity_cat
-
-            if device_class in ["gas", "energy", "water", "monetary", "precipitation"]:
-                payload["state_class"] = "total_increasing"
-            if device_class in ["temperature", "humidity", "pressure", "illuminance", "voltage","wind_speed"]:
-                payload["state_class"] = "measurement"
-            if device_class in ["wind_direction"]:
-                payload["state_class"] = "measurement_angle"
-
-            # UPDATED: Disable expiration for radio_status so it doesn't go Unavailable during silence
-            if "version" not in sensor_name.lower() and not sensor_name.startswith("radio_status"):
-                payload["expire_after"] = config.RTL_EXPIRE_AFTER
+            payload.update(entity_attrs)
             
-            payload["availability_topic"] = self.TOPIC_AVAILABILITY
+            payload["avty_t"] = self.TOPIC_AVAILABILITY
 
             config_topic = f"homeassistant/sensor/{unique_id}/config"
-            self.client.publish(config_topic, json.dumps(payload), retain=True)
+            self.client.publish(config_topic, _json_dumps(payload), retain=True)
             self.discovery_published.add(unique_id)
 
+    def _encode_value(self, value):
+        """Returns the UTF-8 state payload; status/enum-like values reuse cached bytes."""
+        if value.__class__ not in (str, bool):
+            return str(value).encode("utf-8")
+        key = (value.__class__, value)  # keeps True and 1 apart
+        payload = self._payload_cache.get(key)
+        if payload is None:
+            if len(self._payload_cache) >= self.PAYLOAD_CACHE_MAX:
+                self._payload_cache.clear()
+            payload = self._payload_cache[key] = str(value).encode("utf-8")
+        return payload
+
     def send_sensor(self, sensor_id, field, value, device_name, device_model, is_rtl=True, friendly_name=None):
         if value is None: return
 
         self.tracked_devices.add(device_name)
 
-        clean_id = clean_mac(sensor_id) 
-        unique_id_base = clean_id
-        state_topic_base = clean_id
-
-        unique_id = f"{unique_id_base}_{field}"
-        state_topic = f"home/rtl_devices/{state_topic_base}/{field}" 
-
-        self._publish_discovery(field, state_topic, unique_id, device_name, device_model, friendly_name_override=friendly_name)
-
-        unique_id_v2 = f"{unique_id}{config.ID_SUFFIX}"
-        
-        value_changed = self.last_sent_values.get(unique_id_v2) != value
+        # Hot-path attributes bound to locals (LOAD_FAST instead of attribute lookups)
+        topic_cache = self._topic_cache
+        last_sent = self.last_sent_values
+        publish_times = self.last_publish_times
+
+        # Topic/ID strings are fixed per (sensor, field); build them once
+        key = (sensor_id, field)
+        ids = topic_cache.get(key)
+        if ids is None:
+            clean_id = clean_mac(sensor_id)
+            ids = (
+                f"home/rtl_devices/{clean_id}/{field}",
+                f"{clean_id}_{field}{config.ID_SUFFIX}",
+                clean_id,
+            )
+            if len(topic_cache) >= self.TOPIC_CACHE_MAX:
+                topic_cache.clear()
+            topic_cache[key] = ids
+        state_topic, unique_id_v2, clean_id = ids
+
+        if unique_id_v2 not in self.discovery_published:
+            self._publish_discovery(field, state_topic, unique_id_v2, device_name, device_model, friendly_name_override=friendly_name, clean_id=clean_id)
+
+        value_changed = last_sent.get(unique_id_v2) != value
+        now = time.monotonic()
+
+        # Unchanged readings are only re-sent every RTL_REPUBLISH_INTERVAL (keeps HA from expiring them)
+        if not value_changed and is_rtl:
+            if now - publish_times.get(unique_id_v2, 0) < config.RTL_REPUBLISH_INTERVAL:
+                return
 
         if value_changed or is_rtl:
-            self.client.publish(state_topic, str(value), retain=True)
-            self.last_sent_values[unique_id_v2] = value
+            self.client.publish(state_topic, self._encode_value(value), retain=True)
+            last_sent[unique_id_v2] = value
+            publish_times[unique_id_v2] = now
             
             if value_changed:
-                print(f" -> TX {device_name} [{field}]: {value}")
\ No newline at end of file
+                print(f" -> TX {device_name} [{field}]: {value}")
+
+    def send_sensor_batch(self, readings, is_rtl=True):
+        """Publishes a batch of (sensor_id, field, value, device_name, device_model) readings."""
+        send = self.send_sensor
+        for sensor_id, field, value, device_name, device_model in readings:
+            send(sensor_id, field, value, device_name, device_model, is_rtl=is_rtl)
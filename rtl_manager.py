@@ -9,33 +9,75 @@ DESCRIPTION:
 import subprocess
 import json
 import time
-import fnmatch
 import config
 from utils import clean_mac, calculate_dew_point
 
+# Optional fast JSON decoder (accepts str or bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 def flatten(d, sep="_") -> dict:
-    """Recursively flattens a nested dictionary."""
+    """Flattens a nested dictionary (iterative, keeps key order)."""
+    # rtl_433 packets are almost always one level deep: hand those back as-is
+    for v in d.values():
+        if isinstance(v, (dict, list)): break
+    else:
+        return d
+
     obj = {}
-    def recurse(t, parent: str = ""):
-        if isinstance(t, list):
-            for i, v in enumerate(t):
-                recurse(v, f"{parent}{sep}{i}" if parent else str(i))
-        elif isinstance(t, dict):
-            for k, v in t.items():
-                recurse(v, f"{parent}{sep}{k}" if parent else k)
+    stack = [("", d)]
+    while stack:
+        parent, t = stack.pop()
+        if isinstance(t, dict):
+            items = [(f"{parent}{sep}{k}" if parent else k, v) for k, v in t.items()]
+        elif isinstance(t, list):
+            items = [(f"{parent}{sep}{i}" if parent else str(i), v) for i, v in enumerate(t)]
         else:
             if parent: obj[parent] = t
-    recurse(d)
+            continue
+        # Reversed so children pop off the stack in their original order
+        stack.extend(reversed(items))
     return obj
 
-def is_blocked_device(clean_id: str, model: str) -> bool:
-    """Checks against Blacklist in config."""
-    patterns = getattr(config, "DEVICE_BLACKLIST", None)
-    if not patterns: return False
-    for pattern in patterns:
-        if fnmatch.fnmatch(str(clean_id), pattern): return True
-        if fnmatch.fnmatch(str(model), pattern): return True
-    return False
+# --- Restart Backoff ---
+RESTART_DELAY_MIN = 1     # First retry after a crash (seconds)
+RESTART_DELAY_MAX = 30    # Cap while rtl_433 keeps failing
+STABLE_RUN_SECONDS = 60   # A run this long resets the backoff
+
+# --- Utility Meters (consumption needs model-specific handling) ---
+def _neptune_reading(consumption):
+    return "meter_reading", float(consumption) / 10.0
+
+def _scm_reading(consumption):
+    return "Consumption", consumption
+
+# Matched as substrings of the model name, first hit wins
+_METER_HANDLERS = (
+    ("Neptune-R900", _neptune_reading),
+    ("SCM", _scm_reading),
+    ("ERT", _scm_reading),
+)
+_meter_handler_cache = {}
+
+# Keys published as the single 'temperature' entity (F); True = convert from C
+_TEMPERATURE_FIELDS = {
+    "temperature_C": True,
+    "temp_C": True,
+    "temperature_F": False,
+    "temp_F": False,
+    "temperature": False,
+}
+
+def _get_meter_handler(model: str):
+    """Returns the consumption handler for a meter model (False if none), cached per model."""
+    handler = _meter_handler_cache.get(model)
+    if handler is None:
+        handler = next((h for key, h in _METER_HANDLERS if key in model), False)
+        _meter_handler_cache[model] = handler
+    return handler
 
 def discover_default_rtl_serial():
     """Attempts to read the serial number of the first connected RTL-SDR."""
@@ -118,9 +160,17 @@ def rtl_loop(radio_config: dict, mqtt_handler, data_processor, sys_id: str, sys_
 
     print(f"[RTL] Manager started for {radio_name}. Freqs: {frequencies} | Hopping: {hop_interval if len(frequencies)>1 else 'Off'}")
 
+    # --- Per-line lookups hoisted out of the read loop ---
+    skip_keys = config.SKIP_KEYS
+    debug_raw = config.DEBUG_RAW_JSON
+    temperature_fields = _TEMPERATURE_FIELDS
+    send = mqtt_handler.send_sensor
+    dispatch = data_processor.dispatch_reading
+    failures = 0
+
     while True:
         # 1. Announce "Scanning"
-        mqtt_handler.send_sensor(
+        send(
             sys_id, status_field, "Scanning...", sys_name, sys_model, 
             is_rtl=True, friendly_name=status_friendly_name
         )
@@ -128,99 +178,97 @@ def rtl_loop(radio_config: dict, mqtt_handler, data_processor, sys_id: str, sys_
 
         last_log_line = ""
         proc = None
+        started = time.monotonic()
         
         try:
             # stderr=subprocess.STDOUT merges error messages into the standard output stream
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+            # 64 KiB read buffer: a burst of packets is drained in a few read() calls
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=65536)
 
             for line in proc.stdout:
-                if not line: continue
-                safe_line = line.strip()
+                raw_line = line.strip()
+                if not raw_line: continue
 
-                # --- ERROR DETECTION ---
-                if "usb_open error" in safe_line or "No supported devices" in safe_line or "No matching device" in safe_line:
-                    print(f"[{radio_name}] Hardware missing!")
-                    mqtt_handler.send_sensor(
-                        sys_id, status_field, "No Device Found", sys_name, sys_model, 
-                        is_rtl=True, friendly_name=status_friendly_name
-                    )
-                
-                elif "Kernel driver is active" in safe_line or "LIBUSB_ERROR_BUSY" in safe_line:
-                    print(f"[{radio_name}] USB Busy/Driver Error!")
-                    mqtt_handler.send_sensor(
-                        sys_id, status_field, "Error: USB Busy", sys_name, sys_model, 
-                        is_rtl=True, friendly_name=status_friendly_name
-                    )
+                # JSON lines are recognised on the raw bytes; only log/error lines get decoded
+                is_json = raw_line[:1] == b"{" and raw_line[-1:] == b"}"
+                safe_line = "" if is_json else raw_line.decode("utf-8", "replace")
 
                 # --- VALID DATA ---
-                elif safe_line.startswith("{") and safe_line.endswith("}"):
+                if is_json:
                     try:
-                        data = json.loads(safe_line)
-                        # STATUS UPDATE: Online
-                        mqtt_handler.send_sensor(
-                            sys_id, status_field, "Online", sys_name, sys_model, 
-                            is_rtl=True, friendly_name=status_friendly_name
-                        )
-                    except:
+                        data = _json_loads(raw_line)
+                    except ValueError:  # json and orjson decode errors both subclass it
                         continue
 
+                    # STATUS UPDATE: Online
+                    send(
+                        sys_id, status_field, "Online", sys_name, sys_model, 
+                        is_rtl=True, friendly_name=status_friendly_name
+                    )
+
                     # --- SENSOR PROCESSING (Standard) ---
                     model = data.get("model", "Generic")
                     sid = data.get("id") or data.get("channel") or "unknown"
                     clean_id = clean_mac(sid)
                     dev_name = f"{model} ({clean_id})"
 
-                    # Filtering
-                    whitelist = getattr(config, "DEVICE_WHITELIST", [])
-                    if whitelist:
-                        is_allowed = False
-                        for pattern in whitelist:
-                            if fnmatch.fnmatch(str(clean_id), pattern) or fnmatch.fnmatch(model, pattern):
-                                is_allowed = True
-                                break
-                        if not is_allowed: continue
-                    else:
-                        if is_blocked_device(clean_id, model): continue
-
-                    if getattr(config, "DEBUG_RAW_JSON", False):
-                        print(f"[{radio_name}] RX: {safe_line}")
+                    # Filtering (Whitelist overrides Blacklist)
+                    if not config.device_allowed(clean_id, str(model)): continue
+
+                    if debug_raw:
+                        print(f"[{radio_name}] RX: {raw_line.decode('utf-8', 'replace')}")
 
                     # Utilities (Meter Reading Math)
-                    if "Neptune-R900" in model and data.get("consumption") is not None:
-                        real_val = float(data["consumption"]) / 10.0
-                        data_processor.dispatch_reading(clean_id, "meter_reading", real_val, dev_name, model)
-                        del data["consumption"]
-
-                    if ("SCM" in model or "ERT" in model) and data.get("consumption") is not None:
-                        data_processor.dispatch_reading(clean_id, "Consumption", data["consumption"], dev_name, model)
-                        del data["consumption"]
-
-                    # Dew Point Calculation
-                    t_c = None
-                    if "temperature_C" in data: t_c = data["temperature_C"]
-                    elif "temp_C" in data: t_c = data["temp_C"]
-                    elif "temperature_F" in data: t_c = (data["temperature_F"] - 32.0) * 5.0 / 9.0
-                    elif "temperature" in data: t_c = data["temperature"]
-
-                    if t_c is not None and data.get("humidity") is not None:
-                        dp_f = calculate_dew_point(t_c, data["humidity"])
-                        if dp_f is not None:
-                            data_processor.dispatch_reading(clean_id, "dew_point", dp_f, dev_name, model)
+                    meter = _get_meter_handler(model)
+                    if meter:
+                        consumption = data.get("consumption")
+                        if consumption is not None:
+                            meter_field, meter_val = meter(consumption)
+                            dispatch(clean_id, meter_field, meter_val, dev_name, model)
+                            del data["consumption"]
+
+                    # Dew Point Calculation (only packets carrying humidity need the temperature probe)
+                    humidity = data.get("humidity")
+                    if humidity is not None:
+                        t_c = None
+                        if "temperature_C" in data: t_c = data["temperature_C"]
+                        elif "temp_C" in data: t_c = data["temp_C"]
+                        elif "temperature_F" in data: t_c = (data["temperature_F"] - 32.0) * 5.0 / 9.0
+                        elif "temperature" in data: t_c = data["temperature"]
+
+                        if t_c is not None:
+                            dp_f = calculate_dew_point(t_c, humidity)
+                            if dp_f is not None:
+                                dispatch(clean_id, "dew_point", dp_f, dev_name, model)
 
                     # Flatten & Send
                     flat = flatten(data)
                     for key, value in flat.items():
-                        if key in getattr(config, 'SKIP_KEYS', []): continue
+                        if key in skip_keys: continue
                         
-                        # Unit Conversions
-                        if key in ["temperature_C", "temp_C"] and isinstance(value, (int, float)):
-                            val_f = round(value * 1.8 + 32.0, 1)
-                            data_processor.dispatch_reading(clean_id, "temperature", val_f, dev_name, model)
-                        elif key in ["temperature_F", "temp_F", "temperature"] and isinstance(value, (int, float)):
-                            data_processor.dispatch_reading(clean_id, "temperature", value, dev_name, model)
+                        # Unit Conversions (one dict probe; most keys aren't temperatures)
+                        to_f = temperature_fields.get(key)
+                        if to_f is not None and isinstance(value, (int, float)):
+                            if to_f: value = round(value * 1.8 + 32.0, 1)
+                            dispatch(clean_id, "temperature", value, dev_name, model)
                         else:
-                            data_processor.dispatch_reading(clean_id, key, value, dev_name, model)
+                            dispatch(clean_id, key, value, dev_name, model)
                 
+                # --- ERROR DETECTION ---
+                elif "usb_open error" in safe_line or "No supported devices" in safe_line or "No matching device" in safe_line:
+                    print(f"[{radio_name}] Hardware missing!")
+                    send(
+                        sys_id, status_field, "No Device Found", sys_name, sys_model, 
+                        is_rtl=True, friendly_name=status_friendly_name
+                    )
+                
+                elif "Kernel driver is active" in safe_line or "LIBUSB_ERROR_BUSY" in safe_line:
+                    print(f"[{radio_name}] USB Busy/Driver Error!")
+                    send(
+                        sys_id, status_field, "Error: USB Busy", sys_name, sys_model, 
+                        is_rtl=True, friendly_name=status_friendly_name
+                    )
+
                 # --- CATCH ALL: LOG OUTPUT ---
                 else:
                     if safe_line:
@@ -231,17 +279,24 @@ def rtl_loop(radio_config: dict, mqtt_handler, data_processor, sys_id: str, sys_
             if proc.returncode != 0:
                 error_msg = f"Crashed: {last_log_line}" if last_log_line else f"Crashed Code {proc.returncode}"
                 print(f"[{radio_name}] Process exited with code {proc.returncode}")
-                mqtt_handler.send_sensor(
+                send(
                     sys_id, status_field, error_msg[:255], sys_name, sys_model, 
                     is_rtl=True, friendly_name=status_friendly_name
                 )
 
         except Exception as e:
             print(f"[{radio_name}] Exception: {e}")
-            mqtt_handler.send_sensor(
+            send(
                 sys_id, status_field, "Script Error", sys_name, sys_model, 
                 is_rtl=True, friendly_name=status_friendly_name
             )
 
-        print(f"[{radio_name}] Retrying in 30 seconds...")
-        time.sleep(30)
\ No newline at end of file
+        # Transient crashes restart quickly; repeated fast failures back off to RESTART_DELAY_MAX
+        if time.monotonic() - started >= STABLE_RUN_SECONDS:
+            failures = 0
+        delay = min(RESTART_DELAY_MAX, RESTART_DELAY_MIN * 2 ** failures)
+        # Capped: 2**5 already exceeds RESTART_DELAY_MAX, so no need to keep counting
+        failures = min(failures + 1, 5)
+
+        print(f"[{radio_name}] Retrying in {delay} seconds...")
+        time.sleep(delay)
\ No newline at end of file
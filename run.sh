@@ -31,6 +31,10 @@ if [ -f /data/options.json ]; then
         export RTL_THROTTLE_INTERVAL=$(bashio::config 'rtl_throttle_interval')
     fi
 
+    if bashio::config.has_value 'rtl_republish_interval'; then
+        export RTL_REPUBLISH_INTERVAL=$(bashio::config 'rtl_republish_interval')
+    fi
+
     if bashio::config.has_value 'debug_raw_json'; then
         export DEBUG_RAW_JSON=$(bashio::config 'debug_raw_json')
     fi
@@ -38,21 +38,21 @@ class SystemMonitor:
         # 1. CPU (Usually always available)
         try:
             stats["sys_cpu"] = psutil.cpu_percent(interval=1)
-        except:
+        except Exception:
             pass
         
         # 2. Memory (Total System RAM %)
         try:
             svmem = psutil.virtual_memory()
             stats["sys_mem"] = svmem.percent
-        except:
+        except Exception:
             pass
         
         # 3. Script RAM Usage (MB)
         try:
             script_mem_bytes = self.process.memory_info().rss
             stats["sys_script_mem"] = round(script_mem_bytes / 1024 / 1024, 2)
-        except:
+        except Exception:
             pass
         
         # 4. Disk (Root partition)
@@ -60,7 +60,7 @@ class SystemMonitor:
         try:
             total, used, free = shutil.disk_usage("/")
             stats["sys_disk"] = round((used / total) * 100, 1)
-        except:
+        except Exception:
             # Do not add "sys_disk" key if this fails
             pass
 
@@ -83,7 +83,7 @@ class SystemMonitor:
             
             if found_temp is not None:
                 stats["sys_temp"] = found_temp
-        except:
+        except Exception:
             pass
 
         # 6. Uptime
@@ -99,7 +99,7 @@ class SystemMonitor:
             s.connect(("8.8.8.8", 80))
             stats["sys_ip"] = s.getsockname()[0]
             s.close()
-        except:
+        except Exception:
             stats["sys_ip"] = "127.0.0.1"
         
         return stats
\ No newline at end of file
@@ -8,6 +8,7 @@ DESCRIPTION:
 """
 import time
 import threading
+import signal
 import sys
 import importlib.util
 import socket
@@ -101,7 +102,7 @@ def system_stats_loop(mqtt_handler, DEVICE_ID, MODEL_NAME):
 
 if __name__ == "__main__":
     BASE_DEVICE_ID = get_system_mac().replace(":","").lower()
-    BBASE_MODEL_NAME = config.BRIDGE_NAME
+    BASE_MODEL_NAME = config.BRIDGE_NAME
     
     print(f"--- SYSTEM MONITOR STARTING ---")
 
@@ -114,8 +115,11 @@ if __name__ == "__main__":
         daemon=True
     ).start()
 
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
     try:
-        while True: time.sleep(1)
+        stop_event.wait()
     except KeyboardInterrupt:
-        print("\n[SHUTDOWN] Stopping MQTT...")
-        mqtt_handler.stop()
\ No newline at end of file
+        pass
+    print("\n[SHUTDOWN] Stopping MQTT...")
+    mqtt_handler.stop()
\ No newline at end of file
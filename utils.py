@@ -15,6 +15,11 @@ import config
 # Global cache
 _SYSTEM_MAC = None
 
+# Magnus formula coefficients (Sonntag 1990)
+_MAGNUS_B = 17.62
+_MAGNUS_C = 243.12
+_log = math.log
+
 def get_system_mac():
     global _SYSTEM_MAC
     if _SYSTEM_MAC: 
@@ -51,10 +56,8 @@ def calculate_dew_point(temp_c, humidity):
     if humidity <= 0:
         return None 
     try:
-        b = 17.62
-        c = 243.12
-        gamma = (b * temp_c / (c + temp_c)) + math.log(humidity / 100.0)
-        dp_c = (c * gamma) / (b - gamma)
+        gamma = (_MAGNUS_B * temp_c / (_MAGNUS_C + temp_c)) + _log(humidity / 100.0)
+        dp_c = (_MAGNUS_C * gamma) / (_MAGNUS_B - gamma)
         return round(dp_c * 1.8 + 32, 1) # Return Fahrenheit
     except Exception:
         return None
\ No newline at end of file